@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import functools
 import json
 import six
 
@@ -36,6 +37,15 @@ def _check_type(value, expected_type):
     return value
 
 
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls):
+    """Get the names of the slots defined by a class and its bases"""
+    names = []
+    for klass in reversed(cls.__mro__):
+        names.extend(klass.__dict__.get("__slots__", ()))
+    return tuple(names)
+
+
 def _none_as_empty(v):
     if v is not None:
         for e in v:
@@ -48,14 +58,16 @@ class SVDJSONEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, SVDElement):
             eldict = {}
-            for k, v in six.iteritems(obj.__dict__):
+            # subclasses without __slots__ may still carry extra attributes
+            keys = _slot_names(type(obj)) + tuple(getattr(obj, "__dict__", ()))
+            for k in keys:
                 if k in self._TO_DICT_SKIP_KEYS:
                     continue
                 if k.startswith("_"):
                     pubkey = k[1:]
                     eldict[pubkey] = getattr(obj, pubkey)
                 else:
-                    eldict[k] = v
+                    eldict[k] = getattr(obj, k)
             return eldict
         else:
             return json.JSONEncoder.default(self, obj)
@@ -63,10 +75,26 @@ class SVDJSONEncoder(json.JSONEncoder):
 
 class SVDElement(object):
     """Base class for all SVD Elements"""
+    __slots__ = ('parent',)
 
     def __init__(self):
         self.parent = None
 
+    def __getstate__(self):
+        # pickle protocols 0 and 1 cannot handle __slots__ on their own
+        state = {}
+        for k in _slot_names(type(self)):
+            try:
+                state[k] = getattr(self, k)
+            except AttributeError:
+                pass
+        state.update(getattr(self, "__dict__", ()))
+        return state
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            setattr(self, k, v)
+
     def to_dict(self):
         # This is a little convoluted but it works and ensures a
         # json-compatible dictionary representation (at the cost of
@@ -76,6 +104,8 @@ class SVDElement(object):
 
 
 class SVDEnumeratedValue(SVDElement):
+    __slots__ = ('name', 'description', 'value', 'is_default')
+
     def __init__(self, name, description, value, is_default):
         SVDElement.__init__(self)
         self.name = name
@@ -85,6 +115,11 @@ class SVDEnumeratedValue(SVDElement):
 
 
 class SVDField(SVDElement):
+    __slots__ = (
+        'name', 'derived_from', 'description', 'bit_offset', 'bit_width',
+        'access', 'enumerated_values', 'modified_write_values', 'read_action'
+    )
+
     def __init__(self, name, derived_from, description, bit_offset, bit_width, access, enumerated_values, modified_write_values, read_action):
         SVDElement.__init__(self)
         self.name = name
@@ -109,6 +144,12 @@ class SVDField(SVDElement):
 
 class SVDRegisterArray(SVDElement):
     """Represent a register array in the tree"""
+    __slots__ = (
+        'derived_from', 'name', 'description', 'address_offset', 'dim',
+        'dim_indices', 'dim_increment', 'read_action', 'modified_write_values',
+        'display_name', 'alternate_group', 'size', 'access', 'protection',
+        'reset_value', 'reset_mask', 'fields'
+    )
 
     def __init__(self, name, derived_from, description, address_offset, size,
                  access, protection, reset_value, reset_mask, fields,
@@ -143,17 +184,28 @@ class SVDRegisterArray(SVDElement):
 
     @property
     def registers(self):
+        # hoisted out of the loop as arrays may expand to many registers
+        name = self.name
+        dim_indices = self.dim_indices
+        dim_increment = self.dim_increment
+        display_name_fmt = self.display_name
+        expand_display_name = bool(display_name_fmt) and '%s' in display_name_fmt
+        # every register of the array shares the same, read-only fields
+        fields = tuple(self.fields)
+
+        address_offset = self.address_offset
         for i in six.moves.range(self.dim):
-            display_name = self.display_name
-            if self.display_name and '%s' in self.display_name:
-                display_name = self.display_name % self.dim_indices[i]
+            index = dim_indices[i]
+            display_name = display_name_fmt
+            if expand_display_name:
+                display_name = display_name_fmt % index
 
             reg = SVDRegister(
-                name=self.name % self.dim_indices[i],
-                fields=self.fields,
+                name=name % index,
+                fields=fields,
                 derived_from=self.derived_from,
                 description=self.description,
-                address_offset=self.address_offset + self.dim_increment * i,
+                address_offset=address_offset,
                 size=self.size,
                 access=self.access,
                 protection=self.protection,
@@ -165,6 +217,7 @@ class SVDRegisterArray(SVDElement):
                 read_action=self.read_action,
             )
             reg.parent = self.parent
+            address_offset += dim_increment
             yield reg
 
     def is_reserved(self):
@@ -172,6 +225,12 @@ class SVDRegisterArray(SVDElement):
 
 
 class SVDRegister(SVDElement):
+    __slots__ = (
+        'derived_from', 'name', 'description', 'address_offset', 'read_action',
+        'modified_write_values', 'display_name', 'alternate_group', 'size',
+        'access', 'protection', 'reset_value', 'reset_mask', 'fields'
+    )
+
     def __init__(self, name, derived_from, description, address_offset, size, access, protection, reset_value, reset_mask,
                  fields, display_name, alternate_group, modified_write_values, read_action):
         SVDElement.__init__(self)
@@ -204,6 +263,11 @@ class SVDRegister(SVDElement):
 
 class SVDRegisterCluster(SVDElement):
     """Represent a register cluster in the tree"""
+    __slots__ = (
+        'derived_from', 'name', 'description', 'address_offset',
+        'alternate_cluster', 'header_struct_name', 'size', 'access',
+        'protection', 'reset_value', 'reset_mask', 'register', 'cluster'
+    )
 
     def __init__(self, name, derived_from, description, address_offset, size,
                  alternate_cluster, header_struct_name,
@@ -266,6 +330,12 @@ class SVDRegisterCluster(SVDElement):
 
 class SVDRegisterClusterArray(SVDElement):
     """Represent a register cluster in the tree"""
+    __slots__ = (
+        'derived_from', 'name', 'description', 'address_offset', 'dim',
+        'dim_indices', 'dim_increment', 'alternate_cluster',
+        'header_struct_name', 'size', 'access', 'protection', 'reset_value',
+        'reset_mask', 'register', 'cluster'
+    )
 
     def __init__(self, name, derived_from, description, address_offset, size,
                  alternate_cluster, header_struct_name,
@@ -334,6 +404,8 @@ class SVDRegisterClusterArray(SVDElement):
 
 
 class SVDAddressBlock(SVDElement):
+    __slots__ = ('offset', 'size', 'usage')
+
     def __init__(self, offset, size, usage):
         SVDElement.__init__(self)
         self.offset = offset
@@ -342,6 +414,8 @@ class SVDAddressBlock(SVDElement):
 
 
 class SVDInterrupt(SVDElement):
+    __slots__ = ('name', 'value', 'description')
+
     def __init__(self, name, value, description):
         SVDElement.__init__(self)
         self.name = name
@@ -350,6 +424,14 @@ class SVDInterrupt(SVDElement):
 
 
 class SVDPeripheral(SVDElement):
+    __slots__ = (
+        'name', 'version', 'derived_from', 'description', 'prepend_to_name',
+        'base_address', 'address_blocks', 'interrupts', '_registers',
+        'register_arrays', 'size', 'access', 'protection', 'reset_value',
+        'reset_mask', 'group_name', 'append_to_name', 'disable_condition',
+        'clusters'
+    )
+
     def __init__(self, name, version, derived_from, description,
                  prepend_to_name, base_address, address_blocks,
                  interrupts, registers, register_arrays, size, access,
@@ -401,6 +483,13 @@ class SVDPeripheral(SVDElement):
 
 
 class SVDCpu(SVDElement):
+    __slots__ = (
+        'name', 'revision', 'endian', 'mpu_present', 'fpu_present', 'fpu_dp',
+        'icache_present', 'dcache_present', 'itcm_present', 'dtcm_present',
+        'vtor_present', 'nvic_prio_bits', 'vendor_systick_config',
+        'device_num_interrupts', 'sau_num_regions', 'sau_regions_config'
+    )
+
     def __init__(self, name, revision, endian, mpu_present, fpu_present, fpu_dp, icache_present,
                  dcache_present, itcm_present, dtcm_present, vtor_present, nvic_prio_bits,
                  vendor_systick_config, device_num_interrupts, sau_num_regions, sau_regions_config):
@@ -425,6 +514,12 @@ class SVDCpu(SVDElement):
 
 
 class SVDDevice(SVDElement):
+    __slots__ = (
+        'vendor', 'vendor_id', 'name', 'version', 'description', 'cpu',
+        'address_unit_bits', 'width', 'peripherals', 'size', 'access',
+        'protection', 'reset_value', 'reset_mask'
+    )
+
     def __init__(self, vendor, vendor_id, name, version, description, cpu, address_unit_bits, width,
                  peripherals, size, access, protection, reset_value, reset_mask):
         SVDElement.__init__(self)
@@ -14,7 +14,9 @@
 # limitations under the License.
 #
 import os
+import sys
 import copy
+import functools
 from lxml import etree
 
 from cmsis_svd.model import SVDDevice
@@ -28,6 +30,17 @@ from cmsis_svd.model import SVDEnumeratedValue
 from cmsis_svd.model import SVDCpu
 import re
 
+_BITRANGE_RE = re.compile(r'\[([0-9]+):([0-9]+)\]')
+
+# paths evaluated for every peripheral, register and field are compiled once
+_XPATH_PERIPHERALS = etree.XPath('./peripherals/peripheral')
+_XPATH_REGISTERS = etree.XPath('./register')
+_XPATH_CLUSTERS = etree.XPath('./cluster')
+_XPATH_FIELDS = etree.XPath('./fields/field')
+_XPATH_ENUMERATED_VALUES = etree.XPath('./enumeratedValues/enumeratedValue')
+_XPATH_INTERRUPTS = etree.XPath('./interrupt')
+_XPATH_ADDRESS_BLOCKS = etree.XPath('./addressBlock')
+
 class ElementABC(object):
     def __init__(self, tag):
         self.tag = tag
@@ -92,21 +105,18 @@ def _parse_sequences(node, *tags):
 
     for el in node:
         while True:
-            try:
-                tag = next(tag_iter)
-                if tag.tag == el.tag:
-                    res.append(tag.parse(el))
-                    break
-                elif tag.is_optional():
-                    res.append(tag.default)
-                    continue
-                else:
-                    raise KeyError("Expected tag not found in correct place. Expected: {}, Element was: {}\nNode:\n{}".format(tag.tag, el, etree.tostring(node)))
-            except StopIteration:
-                print("Res: {}".format(res))
+            tag = next(tag_iter, None)
+            if tag is None:
                 yield tuple(res)
                 tag_iter = iter(tags)
                 res = []
+            elif tag.tag == el.tag:
+                res.append(tag.parse(el))
+                break
+            elif tag.is_optional():
+                res.append(tag.default)
+            else:
+                raise KeyError("Expected tag not found in correct place. Expected: {}, Element was: {}\nNode:\n{}".format(tag.tag, el, etree.tostring(node)))
 
     if res:
         for remtag in tag_iter:
@@ -118,40 +128,78 @@ def _parse_sequences(node, *tags):
 
 
 
-def _get_text(node, tag, default=None):
-    """Get the text for the provided tag from the provided node"""
-    try:
-        return node.find(tag).text
-    except AttributeError:
+def _index(node):
+    """Map the tag of each child of the provided node to that child
+
+    This lets a node be walked once and its children then looked up by
+    tag instead of searching the node again for every tag.  When a tag
+    is repeated the first child wins, as it would with ``find()``.
+
+    Some tools emit properties as attributes of the node rather than as
+    child elements, so attributes are included too, mapped to their
+    string value.  SVD never uses the same name for both.
+    """
+    if node is None:
+        return {}
+    children = {child.tag: child for child in reversed(node)}
+    if node.attrib:
+        children.update(node.attrib)
+    return children
+
+
+def _get_text(children, tag, default=None):
+    """Get the text for the provided tag from a child index"""
+    child = children.get(tag)
+    if child is None:
         return default
+    elif isinstance(child, str):
+        return child  # value of an attribute
+    return child.text
+
+
+def _get_symbol(children, tag, default=None):
+    """Get the text for a tag whose value is one of a small set of keywords
+
+    Values such as access types are repeated on thousands of registers
+    and fields, so they are interned to share a single string per value.
+    """
+    text_value = _get_text(children, tag)
+    return sys.intern(text_value) if text_value is not None else default
 
 
-def _get_int(node, tag, default=None):
-    text_value = _get_text(node, tag, default)
+def _get_int(children, tag, default=None):
+    text_value = _get_text(children, tag)
+    if text_value is None:
+        return default
+
+    text_value = text_value.strip()
+    prefix = text_value[:2]
     try:
-        if text_value != default:
-            text_value = text_value.strip().lower()
-            if text_value.startswith('0x'):
-                return int(text_value[2:], 16)  # hexadecimal
-            elif text_value.startswith('#'):
-                # TODO(posborne): Deal with strange #1xx case better
-                #
-                # Freescale will sometimes provide values that look like this:
-                #   #1xx
-                # In this case, there are a number of values which all mean the
-                # same thing as the field is a "don't care".  For now, we just
-                # replace those bits with zeros.
-                text_value = text_value.replace('x', '0')[1:]
-                is_bin = all(x in '01' for x in text_value)
-                return int(text_value, 2) if is_bin else int(text_value)  # binary
-            elif text_value.startswith('true'):
-                return 1
-            elif text_value.startswith('false'):
-                return 0
-            else:
-                return int(text_value)  # decimal
+        if prefix == '0x' or prefix == '0X':
+            return int(text_value[2:], 16)  # hexadecimal
+        elif prefix[:1] == '#':
+            # TODO(posborne): Deal with strange #1xx case better
+            #
+            # Freescale will sometimes provide values that look like this:
+            #   #1xx
+            # In this case, there are a number of values which all mean the
+            # same thing as the field is a "don't care".  For now, we just
+            # replace those bits with zeros.
+            text_value = text_value[1:].replace('x', '0').replace('X', '0')
+            is_bin = not text_value.strip('01')
+            return int(text_value, 2) if is_bin else int(text_value)  # binary
+        else:
+            return int(text_value)  # decimal
     except ValueError:
-        return default
+        pass
+
+    # booleans are rare enough that they are only considered once the
+    # numeric forms have been ruled out
+    text_value = text_value.lower()
+    if text_value.startswith('true'):
+        return 1
+    elif text_value.startswith('false'):
+        return 0
     return default
 
 
@@ -166,14 +214,35 @@ class SVDXmlPreprocessing:
         self._root = document_root
 
     @staticmethod
-    def _propagate_register_properties_keys(targets, properties):
+    def _get_property(node, prop):
+        """Get a property given either as an attribute or a child element
+
+        An attribute is returned as its string value and takes precedence,
+        matching how the parser reads the node.
+        """
+        value = node.get(prop)
+        return value if value is not None else node.find(prop)
+
+    @staticmethod
+    def _has_property(node, prop):
+        return node.get(prop) is not None or node.find(prop) is not None
+
+    @classmethod
+    def _propagate_register_properties_keys(cls, targets, properties):
+        properties = [(k, v) for k, v in properties.items() if v is not None]
         for node in targets:
-            for prop in properties:
-                if node.find(prop) is None and properties[prop] is not None:
-                    node.append(copy.deepcopy(properties[prop]))
+            for prop, value in properties:
+                if not cls._has_property(node, prop):
+                    if isinstance(value, str):
+                        etree.SubElement(node, prop).text = value
+                    else:
+                        # copy.copy() of an lxml element already copies its
+                        # whole subtree, without deepcopy()'s memo bookkeeping
+                        node.append(copy.copy(value))
 
     def _propagate_register_properties_group(self):
-        rpg = {k: self._root.find(k) for k in self._REGISTER_PROPERTIES_GROUP}
+        rpg = {k: self._get_property(self._root, k)
+               for k in self._REGISTER_PROPERTIES_GROUP}
 
         self._propagate_register_properties_keys(
             self._root.findall('.//peripheral'), rpg)
@@ -183,9 +252,9 @@ class SVDXmlPreprocessing:
             {'protection': rpg['protection']})
 
         for periph in self._root.findall(".//peripheral"):
-            rpg_copy = copy.deepcopy(rpg)
+            rpg_copy = dict(rpg)
             for k in self._REGISTER_PROPERTIES_GROUP:
-                node_k = periph.find(k)
+                node_k = self._get_property(periph, k)
                 if node_k is not None:
                     rpg_copy[k] = node_k
 
@@ -197,21 +266,32 @@ class SVDXmlPreprocessing:
                 periph.findall('.//addressBlock'),
                 {'protection': rpg_copy['protection']})
 
+        # fields only inherit the access property
         for reg in self._root.findall('.//register'):
-            rpg_copy = copy.deepcopy(rpg)
-            for k in self._REGISTER_PROPERTIES_GROUP:
-                node_k = reg.find(k)
-                if node_k is not None:
-                    rpg_copy[k] = node_k
+            access = self._get_property(reg, 'access')
+            if access is None:
+                access = rpg['access']
 
             self._propagate_register_properties_keys(
-                reg.findall('.//field'), {'access': rpg_copy['access']})
+                reg.findall('./fields/field'), {'access': access})
 
     @staticmethod
     def _derive_tag(src, dst, override=True):
-        dst_tags = [t.tag for t in dst.findall('./')] if override else list()
-        for src_tag in filter(lambda t: t.tag not in dst_tags, src.findall('./')):
+        dst_tags = ({t.tag for t in dst.findall('./')} | set(dst.attrib)
+                    if override else set())
+        missing = [t for t in src.findall('./') if t.tag not in dst_tags]
+        for src_tag in missing:
             dst.append(copy.deepcopy(src_tag))
+        for key, value in src.attrib.items():
+            if key != 'derivedFrom' and key not in dst_tags:
+                dst.set(key, value)
+
+    @staticmethod
+    def _find_named(node, path, name):
+        src = node.find('{}[name="{}"]'.format(path, name))
+        if src is None:
+            src = node.find('{}[@name="{}"]'.format(path, name))
+        return src
 
     def _derived_from_enumerated_values(self):
         for dst in self._root.findall('.//enumeratedValues[@derivedFrom]'):
@@ -226,7 +306,7 @@ class SVDXmlPreprocessing:
             derived_path = dst.attrib['derivedFrom'].split('.')
 
             if len(derived_path) == 1:
-                src = dst.find('../field[name="{}"]'.format(derived_path[0]))
+                src = self._find_named(dst, '../field', derived_path[0])
             elif len(derived_path) == 3:
                 src = self._root.find('.//peripheral[name="{}"]'
                                       '//register[name="{}"]//field[name="{}"]'
@@ -235,8 +315,8 @@ class SVDXmlPreprocessing:
             else:
                 src = None
 
-            if (src is not None and dst.find('./name') is not None
-                    and dst.find('./description') is not None):
+            if (src is not None and self._has_property(dst, 'name')
+                    and self._has_property(dst, 'description')):
                 self._derive_tag(src, dst)
 
     def _derived_from_register(self):
@@ -244,7 +324,7 @@ class SVDXmlPreprocessing:
             derived_path = dst.attrib['derivedFrom'].split('.')
 
             if len(derived_path) == 1:
-                src = dst.find('../register[name="{}"]'.format(derived_path[0]))
+                src = self._find_named(dst, '../register', derived_path[0])
             elif len(derived_path) == 2:
                 src = self._root.find('.//peripheral[name="{}"]'
                                       '//register[name="{}"]'.format(
@@ -252,9 +332,9 @@ class SVDXmlPreprocessing:
             else:
                 src = None
 
-            if (src is not None and dst.find('./name') is not None
-                    and dst.find('./description') is not None
-                    and dst.find('./addressOffset') is not None):
+            if (src is not None and self._has_property(dst, 'name')
+                    and self._has_property(dst, 'description')
+                    and self._has_property(dst, 'addressOffset')):
                 self._derive_tag(src, dst)
 
     def _derived_from_cluster(self):
@@ -262,7 +342,7 @@ class SVDXmlPreprocessing:
             derived_path = dst.attrib['derivedFrom'].split('.')
 
             if len(derived_path) == 1:
-                src = dst.find('../cluster[name="{}"]'.format(derived_path[0]))
+                src = self._find_named(dst, '../cluster', derived_path[0])
             elif len(derived_path) == 2:
                 src = self._root.find('.//peripheral[name="{}"]'
                                       '//cluster[name="{}"]'.format(
@@ -270,15 +350,15 @@ class SVDXmlPreprocessing:
             else:
                 src = None
 
-            if (src is not None and dst.find('./name') is not None
-                    and dst.find('./description') is not None
-                    and dst.find('./addressOffset') is not None):
+            if (src is not None and self._has_property(dst, 'name')
+                    and self._has_property(dst, 'description')
+                    and self._has_property(dst, 'addressOffset')):
                 self._derive_tag(src, dst)
 
     def _derived_from_peripherals(self):
         for dst in self._root.findall('.//peripheral[@derivedFrom]'):
-            src = self._root.find('.//peripheral[name="{}"]'.format(
-                                  dst.attrib['derivedFrom']))
+            src = self._find_named(self._root, './/peripheral',
+                                   dst.attrib['derivedFrom'])
             if src is not None:
                 self._derive_tag(src, dst)
 
@@ -291,6 +371,27 @@ class SVDXmlPreprocessing:
         self._propagate_register_properties_group()
 
 
+def _parse_xml_file(path):
+    xml_parser = etree.XMLParser(remove_blank_text=True,
+                                 remove_comments=True)
+    return etree.parse(path, xml_parser)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_preprocessed_tree(path, mtime):
+    """Parse and preprocess the SVD file at the provided path
+
+    The result is cached, so callers must copy the returned tree rather
+    than hand it out directly.  The modification time is only taken as
+    part of the cache key so that a file changed on disk is reloaded.
+    Only a handful of documents are kept as a large vendor file can take
+    up tens of megabytes once parsed.
+    """
+    tree = _parse_xml_file(path)
+    SVDXmlPreprocessing(tree.getroot()).preprocess_xml()
+    return tree
+
+
 class SVDParser(object):
     """The SVDParser is responsible for mapping the SVD XML to Python Objects"""
 
@@ -301,11 +402,15 @@ class SVDParser(object):
         These files often have either the .xml or .svd extension and may
         be found as part of CMSIS packs or as part of the data provided
         by the cmsis-svd project.
+
+        Comments and ignorable whitespace are dropped while parsing as
+        they are never consulted and account for a large share of the
+        document tree on big vendor files.
         """
-        return cls(etree.parse(path))
+        return cls(_parse_xml_file(path))
 
     @classmethod
-    def for_packaged_svd(cls, package_root, vendor, filename):
+    def for_packaged_svd(cls, package_root, vendor, filename, cache=False):
         """Find SVD for a given vendor/mcu within packaged data
 
         This convenience method requires a "package_root" which is
@@ -317,20 +422,41 @@ class SVDParser(object):
         In prior releases, this information was directly distributed
         as part of the python package but that is no longer the case
         as of version 0.5.
+
+        Packaged SVD files are not expected to change, so when "cache"
+        is set the parsed and preprocessed document is kept in memory and
+        each returned parser works on its own copy of it.  This speeds up
+        loading the same file repeatedly at the cost of holding the last
+        few documents (tens of megabytes each for large vendor files)
+        until `clear_cache` is called.
         """
         path = os.path.join(package_root, vendor, filename)
         if os.path.exists(path):
-            return cls.for_xml_file(path)
+            return cls._for_packaged_xml_file(path, cache)
 
         # some vendors like SiliconLabs currently have more deeply nested
         # directory structures, attempt to find recursively.
         for root, _dirs, filenames in os.walk(os.path.join(package_root, vendor)):
             for fname in filenames:
                 if fname == filename:
-                    return cls.for_xml_file(os.path.join(root, fname))
+                    return cls._for_packaged_xml_file(os.path.join(root, fname), cache)
 
         return None
 
+    @classmethod
+    def _for_packaged_xml_file(cls, path, cache):
+        if not cache:
+            return cls.for_xml_file(path)
+        tree = _load_preprocessed_tree(path, os.path.getmtime(path))
+        parser = cls(copy.deepcopy(tree))
+        parser._preprocessed = True
+        return parser
+
+    @staticmethod
+    def clear_cache():
+        """Drop the documents cached by `for_packaged_svd`"""
+        _load_preprocessed_tree.cache_clear()
+
     @classmethod
     def for_mcu(cls, package_root, mcu):
         """Attempt to find SVD for a given mcu by name within package root
@@ -370,70 +496,82 @@ class SVDParser(object):
         self.remove_reserved = remove_reserved
         self._tree = tree
         self._root = self._tree.getroot()
+        self._preprocessed = False
 
     def _parse_enumerated_value(self, enumerated_value_node):
+        children = _index(enumerated_value_node)
         return SVDEnumeratedValue(
-            name=_get_text(enumerated_value_node, 'name'),
-            description=_get_text(enumerated_value_node, 'description'),
-            value=_get_int(enumerated_value_node, 'value'),
-            is_default=_get_int(enumerated_value_node, 'isDefault')
+            name=_get_text(children, 'name'),
+            description=_get_text(children, 'description'),
+            value=_get_int(children, 'value'),
+            is_default=_get_int(children, 'isDefault')
         )
 
     def _parse_field(self, field_node, register_node):
-        enumerated_values = []
-        for enumerated_value_node in field_node.findall("./enumeratedValues/enumeratedValue"):
-            enumerated_values.append(self._parse_enumerated_value(enumerated_value_node))
-
-        modified_write_values=_get_text(field_node, 'modifiedWriteValues')
-        read_action=_get_text(field_node, 'readAction')
-        bit_range = _get_text(field_node, 'bitRange')
-        bit_offset = _get_int(field_node, 'bitOffset')
-        bit_width = _get_int(field_node, 'bitWidth')
-        msb = _get_int(field_node, 'msb')
-        lsb = _get_int(field_node, 'lsb')
+        children = _index(field_node)
+        parse_enumerated_value = self._parse_enumerated_value
+        enumerated_values = [
+            parse_enumerated_value(enumerated_value_node)
+            for enumerated_value_node in _XPATH_ENUMERATED_VALUES(field_node)
+        ]
+
+        modified_write_values=_get_symbol(children, 'modifiedWriteValues')
+        read_action=_get_symbol(children, 'readAction')
+
+        # the bit position is given in one of three forms, only read the
+        # tags of the form actually present
+        bit_range = _get_text(children, 'bitRange')
         if bit_range is not None:
-            m = re.search('\[([0-9]+):([0-9]+)\]', bit_range)
-            bit_offset = int(m.group(2))
-            bit_width = 1 + (int(m.group(1)) - int(m.group(2)))
-        elif msb is not None:
+            m = _BITRANGE_RE.search(bit_range)
+            msb = int(m.group(1))
+            lsb = int(m.group(2))
+        else:
+            msb = _get_int(children, 'msb')
+            lsb = _get_int(children, 'lsb') if msb is not None else None
+
+        if msb is not None:
             bit_offset = lsb
             bit_width = 1 + (msb - lsb)
+        else:
+            bit_offset = _get_int(children, 'bitOffset')
+            bit_width = _get_int(children, 'bitWidth')
 
         return SVDField(
-            name=_get_text(field_node, 'name'),
+            name=_get_text(children, 'name'),
             derived_from=field_node.get('derivedFrom'),
-            description=_get_text(field_node, 'description'),
+            description=_get_text(children, 'description'),
             bit_offset=bit_offset,
             bit_width=bit_width,
-            access=_get_text(field_node, 'access'),
+            access=_get_symbol(children, 'access'),
             enumerated_values=enumerated_values or None,
             modified_write_values=modified_write_values,
             read_action=read_action,
         )
 
     def _parse_registers(self, register_node):
-        fields = []
-        for field_node in register_node.findall('.//field'):
-            node = self._parse_field(field_node, register_node)
-            if not self.remove_reserved or 'reserved' not in node.name.lower():
-                fields.append(node)
-
-        dim = _get_int(register_node, 'dim')
-        name = _get_text(register_node, 'name')
+        children = _index(register_node)
+        parse_field = self._parse_field
+        fields = [parse_field(field_node, register_node)
+                  for field_node in _XPATH_FIELDS(register_node)]
+        if self.remove_reserved:
+            fields = [f for f in fields if 'reserved' not in f.name.lower()]
+
+        dim = _get_int(children, 'dim')
+        name = _get_text(children, 'name')
         derived_from = register_node.get('derivedFrom')
-        description = _get_text(register_node, 'description')
-        address_offset = _get_int(register_node, 'addressOffset')
-        size = _get_int(register_node, 'size')
-        access = _get_text(register_node, 'access')
-        protection = _get_text(register_node, 'protection')
-        reset_value = _get_int(register_node, 'resetValue')
-        reset_mask = _get_int(register_node, 'resetMask')
-        dim_increment = _get_int(register_node, 'dimIncrement')
-        dim_index_text = _get_text(register_node, 'dimIndex')
-        display_name = _get_text(register_node, 'displayName')
-        alternate_group = _get_text(register_node, 'alternateGroup')
-        modified_write_values = _get_text(register_node, 'modifiedWriteValues')
-        read_action = _get_text(register_node, 'readAction')
+        description = _get_text(children, 'description')
+        address_offset = _get_int(children, 'addressOffset')
+        size = _get_int(children, 'size')
+        access = _get_symbol(children, 'access')
+        protection = _get_symbol(children, 'protection')
+        reset_value = _get_int(children, 'resetValue')
+        reset_mask = _get_int(children, 'resetMask')
+        dim_increment = _get_int(children, 'dimIncrement')
+        dim_index_text = _get_text(children, 'dimIndex')
+        display_name = _get_text(children, 'displayName')
+        alternate_group = _get_text(children, 'alternateGroup')
+        modified_write_values = _get_symbol(children, 'modifiedWriteValues')
+        read_action = _get_symbol(children, 'readAction')
 
         if dim is None:
             return SVDRegister(
@@ -508,26 +646,27 @@ class SVDParser(object):
             )
 
     def _parse_cluster(self, cluster_node):
-        dim = _get_int(cluster_node, 'dim')
-        name = _get_text(cluster_node, 'name')
+        children = _index(cluster_node)
+        dim = _get_int(children, 'dim')
+        name = _get_text(children, 'name')
         derived_from = cluster_node.get('derivedFrom')
-        description = _get_text(cluster_node, 'description')
-        address_offset = _get_int(cluster_node, 'addressOffset')
-        size = _get_int(cluster_node, 'size')
-        access = _get_text(cluster_node, 'access')
-        protection = _get_text(cluster_node, 'protection')
-        reset_value = _get_int(cluster_node, 'resetValue')
-        reset_mask = _get_int(cluster_node, 'resetMask')
-        dim_increment = _get_int(cluster_node, 'dimIncrement')
-        dim_index_text = _get_text(cluster_node, 'dimIndex')
-        alternate_cluster = _get_text(cluster_node, 'alternateCluster')
-        header_struct_name = _get_text(cluster_node, 'headerStructName')
-        cluster = []
-        for sub_cluster_node in cluster_node.findall("./cluster"):
-            cluster.append(self._parse_cluster(sub_cluster_node))
-        register = []
-        for reg_node in cluster_node.findall("./register"):
-            register.append(self._parse_registers(reg_node))
+        description = _get_text(children, 'description')
+        address_offset = _get_int(children, 'addressOffset')
+        size = _get_int(children, 'size')
+        access = _get_symbol(children, 'access')
+        protection = _get_symbol(children, 'protection')
+        reset_value = _get_int(children, 'resetValue')
+        reset_mask = _get_int(children, 'resetMask')
+        dim_increment = _get_int(children, 'dimIncrement')
+        dim_index_text = _get_text(children, 'dimIndex')
+        alternate_cluster = _get_text(children, 'alternateCluster')
+        header_struct_name = _get_text(children, 'headerStructName')
+        parse_cluster = self._parse_cluster
+        cluster = [parse_cluster(sub_cluster_node)
+                   for sub_cluster_node in _XPATH_CLUSTERS(cluster_node)]
+        parse_registers = self._parse_registers
+        register = [parse_registers(reg_node)
+                    for reg_node in _XPATH_REGISTERS(cluster_node)]
 
         if dim is None:
             return SVDRegisterCluster(
@@ -578,10 +717,11 @@ class SVDParser(object):
             )
 
     def _parse_address_block(self, address_block_node):
+        children = _index(address_block_node)
         return SVDAddressBlock(
-            _get_int(address_block_node, 'offset'),
-            _get_int(address_block_node, 'size'),
-            _get_text(address_block_node, 'usage')
+            _get_int(children, 'offset'),
+            _get_int(children, 'size'),
+            _get_symbol(children, 'usage')
         )
 
     def _parse_interrupts(self, interrupt_node):
@@ -591,70 +731,75 @@ class SVDParser(object):
             TextElement('value'),
         ]
 
+        children = _index(interrupt_node)
         for (name, value, description) in _parse_sequences(interrupt_node, *tags):
             yield SVDInterrupt(
-                name=_get_text(interrupt_node, 'name'),
-                value=_get_int(interrupt_node, 'value'),
-                description=_get_text(interrupt_node, 'description'))
+                name=_get_text(children, 'name'),
+                value=_get_int(children, 'value'),
+                description=_get_text(children, 'description'))
 
     def _parse_peripheral(self, peripheral_node):
-        # parse registers
-        registers = None if peripheral_node.find('registers') is None else []
-        register_arrays = None if peripheral_node.find('registers') is None else []
-        for register_node in peripheral_node.findall('./registers/register'):
-            reg = self._parse_registers(register_node)
-            if isinstance(reg, SVDRegisterArray):
-                register_arrays.append(reg)
-            else:
-                registers.append(reg)
+        children = _index(peripheral_node)
 
+        # parse registers
+        registers_node = children.get('registers')
+        registers = None if registers_node is None else []
+        register_arrays = None if registers_node is None else []
         clusters = []
-        for cluster_node in peripheral_node.findall('./registers/cluster'):
-            reg = self._parse_cluster(cluster_node)
-            clusters.append(reg)
+        if registers_node is not None:
+            parse_registers = self._parse_registers
+            for register_node in _XPATH_REGISTERS(registers_node):
+                reg = parse_registers(register_node)
+                if isinstance(reg, SVDRegisterArray):
+                    register_arrays.append(reg)
+                else:
+                    registers.append(reg)
+
+            parse_cluster = self._parse_cluster
+            clusters = [parse_cluster(cluster_node)
+                        for cluster_node in _XPATH_CLUSTERS(registers_node)]
 
         # parse all interrupts for the peripheral
         interrupts = []
-        for interrupt_node in peripheral_node.findall('./interrupt'):
-            for interrupt in self._parse_interrupts(interrupt_node):
-                interrupts.append(interrupt)
+        for interrupt_node in _XPATH_INTERRUPTS(peripheral_node):
+            interrupts.extend(self._parse_interrupts(interrupt_node))
         interrupts = interrupts if interrupts else None
 
         # parse all address blocks for the peripheral
-        address_blocks = []
-        for address_block_node in peripheral_node.findall('./addressBlock'):
-            address_blocks.append(self._parse_address_block(address_block_node))
+        parse_address_block = self._parse_address_block
+        address_blocks = [parse_address_block(address_block_node)
+                          for address_block_node in _XPATH_ADDRESS_BLOCKS(peripheral_node)]
         address_blocks = address_blocks if address_blocks else None
 
         return SVDPeripheral(
             # <name>identifierType</name>
             # <version>xs:string</version>
             # <description>xs:string</description>
-            name=_get_text(peripheral_node, 'name'),
-            version=_get_text(peripheral_node, 'version'),
+            name=_get_text(children, 'name'),
+            version=_get_text(children, 'version'),
             derived_from=peripheral_node.get('derivedFrom'),
-            description=_get_text(peripheral_node, 'description'),
+            description=_get_text(children, 'description'),
 
             # <groupName>identifierType</groupName>
             # <prependToName>identifierType</prependToName>
             # <appendToName>identifierType</appendToName>
             # <disableCondition>xs:string</disableCondition>
             # <baseAddress>scaledNonNegativeInteger</baseAddress>
-            group_name=_get_text(peripheral_node, 'groupName'),
-            prepend_to_name=_get_text(peripheral_node, 'prependToName'),
-            append_to_name=_get_text(peripheral_node, 'appendToName'),
-            disable_condition=_get_text(peripheral_node, 'disableCondition'),
-            base_address=_get_int(peripheral_node, 'baseAddress'),
+            group_name=_get_text(children, 'groupName'),
+            prepend_to_name=_get_text(children, 'prependToName'),
+            append_to_name=_get_text(children, 'appendToName'),
+            disable_condition=_get_text(children, 'disableCondition'),
+            base_address=_get_int(children, 'baseAddress'),
 
             # <!-- registerPropertiesGroup -->
             # <size>scaledNonNegativeInteger</size>
             # <access>accessType</access>
             # <resetValue>scaledNonNegativeInteger</resetValue>
             # <resetMask>scaledNonNegativeInteger</resetMask>
-            size=_get_int(peripheral_node, "size"),
-            access=_get_text(peripheral_node, 'access'),
-            reset_value=_get_int(peripheral_node, "resetValue"),
-            reset_mask=_get_int(peripheral_node, "resetMask"),
+            size=_get_int(children, "size"),
+            access=_get_symbol(children, 'access'),
+            reset_value=_get_int(children, "resetValue"),
+            reset_mask=_get_int(children, "resetMask"),
 
             # <addressBlock>
             #     <offset>scaledNonNegativeInteger</offset>
@@ -683,55 +828,59 @@ class SVDParser(object):
             clusters=clusters,
 
             # (not mentioned in docs -- applies to all registers)
-            protection=_get_text(peripheral_node, 'protection'),
+            protection=_get_symbol(children, 'protection'),
         )
 
     def _parse_device(self, device_node):
-        peripherals = []
-        for peripheral_node in device_node.findall('.//peripheral'):
-            peripherals.append(self._parse_peripheral(peripheral_node))
-        cpu_node = device_node.find('./cpu')
+        children = _index(device_node)
+        parse_peripheral = self._parse_peripheral
+        peripherals = [parse_peripheral(peripheral_node)
+                       for peripheral_node in _XPATH_PERIPHERALS(device_node)]
+        cpu_children = _index(children.get('cpu'))
         cpu = SVDCpu(
-            name=_get_text(cpu_node, 'name'),
-            revision=_get_text(cpu_node, 'revision'),
-            endian=_get_text(cpu_node, 'endian'),
-            mpu_present=_get_int(cpu_node, 'mpuPresent'),
-            fpu_present=_get_int(cpu_node, 'fpuPresent'),
-            fpu_dp=_get_int(cpu_node, 'fpuDP'),
-            icache_present=_get_int(cpu_node, 'icachePresent'),
-            dcache_present=_get_int(cpu_node, 'dcachePresent'),
-            itcm_present=_get_int(cpu_node, 'itcmPresent'),
-            dtcm_present=_get_int(cpu_node, 'dtcmPresent'),
-            vtor_present=_get_int(cpu_node, 'vtorPresent'),
-            nvic_prio_bits=_get_int(cpu_node, 'nvicPrioBits'),
-            vendor_systick_config=_get_int(cpu_node, 'vendorSystickConfig'),
-            device_num_interrupts=_get_int(cpu_node, 'deviceNumInterrupts'),
-            sau_num_regions=_get_int(cpu_node, 'sauNumRegions'),
-            sau_regions_config=_get_text(cpu_node, 'sauRegionsConfig')
+            name=_get_text(cpu_children, 'name'),
+            revision=_get_text(cpu_children, 'revision'),
+            endian=_get_symbol(cpu_children, 'endian'),
+            mpu_present=_get_int(cpu_children, 'mpuPresent'),
+            fpu_present=_get_int(cpu_children, 'fpuPresent'),
+            fpu_dp=_get_int(cpu_children, 'fpuDP'),
+            icache_present=_get_int(cpu_children, 'icachePresent'),
+            dcache_present=_get_int(cpu_children, 'dcachePresent'),
+            itcm_present=_get_int(cpu_children, 'itcmPresent'),
+            dtcm_present=_get_int(cpu_children, 'dtcmPresent'),
+            vtor_present=_get_int(cpu_children, 'vtorPresent'),
+            nvic_prio_bits=_get_int(cpu_children, 'nvicPrioBits'),
+            vendor_systick_config=_get_int(cpu_children, 'vendorSystickConfig'),
+            device_num_interrupts=_get_int(cpu_children, 'deviceNumInterrupts'),
+            sau_num_regions=_get_int(cpu_children, 'sauNumRegions'),
+            sau_regions_config=_get_text(cpu_children, 'sauRegionsConfig')
         )
 
         return SVDDevice(
-            vendor=_get_text(device_node, 'vendor'),
-            vendor_id=_get_text(device_node, 'vendorID'),
-            name=_get_text(device_node, 'name'),
-            version=_get_text(device_node, 'version'),
-            description=_get_text(device_node, 'description'),
+            vendor=_get_text(children, 'vendor'),
+            vendor_id=_get_text(children, 'vendorID'),
+            name=_get_text(children, 'name'),
+            version=_get_text(children, 'version'),
+            description=_get_text(children, 'description'),
             cpu=cpu,
-            address_unit_bits=_get_int(device_node, 'addressUnitBits'),
-            width=_get_int(device_node, 'width'),
+            address_unit_bits=_get_int(children, 'addressUnitBits'),
+            width=_get_int(children, 'width'),
             peripherals=peripherals,
-            size=_get_int(device_node, "size"),
-            access=_get_text(device_node, 'access'),
-            protection=_get_text(device_node, 'protection'),
-            reset_value=_get_int(device_node, "resetValue"),
-            reset_mask=_get_int(device_node, "resetMask")
+            size=_get_int(children, "size"),
+            access=_get_symbol(children, 'access'),
+            protection=_get_symbol(children, 'protection'),
+            reset_value=_get_int(children, "resetValue"),
+            reset_mask=_get_int(children, "resetMask")
         )
 
     def get_device(self):
         """Get the device described by this SVD"""
-        SVDXmlPreprocessing(self._root).preprocess_xml()
+        if not self._preprocessed:
+            SVDXmlPreprocessing(self._root).preprocess_xml()
+            self._preprocessed = True
         return self._parse_device(self._root)
 
 
-def duplicate_array_of_registers(svdreg):  # expects a SVDRegister which is an array of registers
-    assert (svdreg.dim == len(svdreg.dim_index))
+def duplicate_array_of_registers(svdreg):  # expects a SVDRegisterArray
+    assert svdreg.dim == len(svdreg.dim_indices)
+    return list(svdreg.registers)
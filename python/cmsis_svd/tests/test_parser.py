@@ -14,8 +14,11 @@
 # limitations under the License.
 #
 import json
+import pickle
 
-from cmsis_svd.parser import SVDParser
+from lxml import etree
+
+from cmsis_svd.parser import SVDParser, _load_preprocessed_tree, duplicate_array_of_registers
 import os
 import unittest
 
@@ -23,6 +26,24 @@ THIS_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(THIS_DIR, "..", "..", "..", "cmsis-svd-data", "data")
 
 
+def _parse_svd_bytes(registers, peripheral_properties=b""):
+    """Parse a device with a single peripheral holding the provided registers"""
+    svd = b"""<device>
+        <name>TEST</name>
+        <addressUnitBits>8</addressUnitBits>
+        <width>32</width>
+        <peripherals>
+            <peripheral>
+                <name>TIMER0</name>
+                <baseAddress>0x40010000</baseAddress>
+                %s
+                <registers>%s</registers>
+            </peripheral>
+        </peripherals>
+    </device>""" % (peripheral_properties, registers)
+    return SVDParser(etree.ElementTree(etree.fromstring(svd))).get_device()
+
+
 def make_svd_validator(svd_path):
     def verify_svd_validity():
         parser = SVDParser.for_xml_file(svd_path)
@@ -69,6 +90,14 @@ class TestParserFreescale(unittest.TestCase):
         # self._regenerate_json(d)  # uncomment to regenerate (temporarily)
         self.assertDictEqual(d, self._get_json())
 
+    def test_pickle_round_trip(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                device = pickle.loads(pickle.dumps(self.device, protocol))
+                self.assertDictEqual(device.to_dict(), self._get_json())
+                uart0 = [p for p in device.peripherals if p.name == "UART0"][0]
+                self.assertIs(uart0.parent, device)
+
     def test_device_attributes(self):
         device = self.device
         self.assertEqual(device.vendor, "Freescale Semiconductor, Inc.")
@@ -258,6 +287,15 @@ class TestParserNordic(unittest.TestCase):
                          [('DAB[%s]', 8, [0, 1, 2, 3, 4, 5, 6, 7], 4),
                           ('DAP[%s]', 8, [0, 1, 2, 3, 4, 5, 6, 7], 4)])
 
+    def test_duplicate_array_of_registers(self):
+        radio = [p for p in self.device.peripherals if p.name == "RADIO"][0]
+        dab = [r for r in radio.register_arrays if r.name == "DAB[%s]"][0]
+        regs = duplicate_array_of_registers(dab)
+        self.assertEqual([(r.name, r.address_offset) for r in regs],
+                         [("DAB[%d]" % i, 0x600 + 4 * i) for i in range(8)])
+        self.assertIsInstance(regs[0].fields, tuple)
+        self.assertIs(regs[0].fields, regs[-1].fields)
+
     def test_register_cluster_array(self):
         ppi = [p for p in self.device.peripherals if p.name == "PPI"][0]
         regs = list(ppi.registers)
@@ -318,6 +356,17 @@ class TestParserExample(unittest.TestCase):
         self.assertEqual(timer0.reset_value, timer1.reset_value)
         self.assertEqual(timer0.reset_mask, timer1.reset_mask)
 
+    def test_packaged_svd_parsers_are_independent(self):
+        SVDParser.clear_cache()
+        self.addCleanup(SVDParser.clear_cache)
+        parser1 = SVDParser.for_packaged_svd(DATA_DIR, "ARM_SAMPLE", "ARM_Sample.svd", cache=True)
+        parser2 = SVDParser.for_packaged_svd(DATA_DIR, "ARM_SAMPLE", "ARM_Sample.svd", cache=True)
+        self.assertEqual(_load_preprocessed_tree.cache_info().hits, 1)
+
+        parser1._root.find('./peripherals/peripheral/name').text = "CHANGED"
+        self.assertEqual(parser1.get_device().peripherals[0].name, "CHANGED")
+        self.assertEqual(parser2.get_device().peripherals[0].name, "TIMER0")
+
 
 class TestParserToDict(unittest.TestCase):
     def test_to_dict_dim_indices(self):
@@ -339,6 +388,92 @@ class TestParserNXP(unittest.TestCase):
         self.assertEqual( ssp2.base_address + ssp2cr1.address_offset , 0x400ac004)
 
 
+class TestParserAttributes(unittest.TestCase):
+    def test_properties_as_attributes(self):
+        device = _parse_svd_bytes(b"""
+            <register name="CR" addressOffset="0x4" size="16" access="read-write">
+                <fields>
+                    <field name="EN" bitOffset="3" bitWidth="2"/>
+                </fields>
+            </register>""")
+        reg = device.peripherals[0].registers[0]
+        self.assertEqual((reg.name, reg.address_offset, reg.size, reg.access),
+                         ("CR", 4, 16, "read-write"))
+        field = reg.fields[0]
+        self.assertEqual((field.name, field.bit_offset, field.bit_width),
+                         ("EN", 3, 2))
+
+    def test_field_inherits_register_access_attribute(self):
+        device = _parse_svd_bytes(b"""
+            <register name="CR" addressOffset="0" access="write-only">
+                <fields>
+                    <field name="EN" bitOffset="0" bitWidth="1"/>
+                </fields>
+            </register>""", b"<access>read-only</access>")
+        reg = device.peripherals[0].registers[0]
+        self.assertEqual(reg.access, "write-only")
+        self.assertEqual(reg.fields[0].access, "write-only")
+
+    def test_register_inherits_peripheral_access_attribute(self):
+        svd = b"""<device>
+            <name>TEST</name>
+            <addressUnitBits>8</addressUnitBits>
+            <width>32</width>
+            <peripherals>
+                <peripheral name="TIMER0" baseAddress="0x40010000" access="read-only">
+                    <registers>
+                        <register name="CR" addressOffset="0">
+                            <fields>
+                                <field name="EN" bitOffset="0" bitWidth="1"/>
+                            </fields>
+                        </register>
+                    </registers>
+                </peripheral>
+            </peripherals>
+        </device>"""
+        device = SVDParser(etree.ElementTree(etree.fromstring(svd))).get_device()
+        reg = device.peripherals[0].registers[0]
+        self.assertEqual((reg.access, reg.fields[0].access),
+                         ("read-only", "read-only"))
+
+    def test_derived_register_with_attributes(self):
+        device = _parse_svd_bytes(b"""
+            <register name="SR" addressOffset="0" access="write-only">
+                <fields>
+                    <field name="EN" bitOffset="0" bitWidth="1"/>
+                </fields>
+            </register>
+            <register derivedFrom="SR" name="SR2" description="x" addressOffset="8"/>""",
+            b"<access>read-only</access>")
+        regs = {r.name: r for r in device.peripherals[0].registers}
+        self.assertEqual(sorted(regs), ["SR", "SR2"])
+        sr2 = regs["SR2"]
+        self.assertEqual((sr2.address_offset, sr2.access), (8, "write-only"))
+        self.assertEqual([(f.name, f.access) for f in sr2.fields],
+                         [("EN", "write-only")])
+
+
+class TestParserBitRange(unittest.TestCase):
+    def test_padded_bit_range(self):
+        device = _parse_svd_bytes(b"""
+            <register>
+                <name>CR</name>
+                <addressOffset>0x0</addressOffset>
+                <fields>
+                    <field><name>LOW</name><bitRange> [7:0]</bitRange></field>
+                    <field>
+                        <name>HIGH</name>
+                        <bitRange>
+                            [15:8]
+                        </bitRange>
+                    </field>
+                </fields>
+            </register>""")
+        reg = device.peripherals[0].registers[0]
+        self.assertEqual([(f.name, f.bit_offset, f.bit_width) for f in reg.fields],
+                         [("LOW", 0, 8), ("HIGH", 8, 8)])
+
+
 class TestTreeSearch(unittest.TestCase):
     def test_find_basic_mcu(self):
         self.assertIsNotNone(SVDParser.for_mcu(DATA_DIR, "LPC178x_7x"))